@@ -1,13 +1,13 @@
-from datetime import datetime
 from io import StringIO
 import time
-from src.git_ir import all_objects, git_log, git_obj, format_git_logs_as_string
+from src.git_ir import all_objects, cached_git_log, git_obj, format_git_logs_as_string
 from src.util.git_util import git_run
 from subprocess import run as sp_run
 import numpy as np
 from statistics import stdev
 import logging
 from collections import defaultdict
+from src.util.date_util import month_key
 
 logging.basicConfig(
     level=logging.DEBUG,  # Set the desired log level
@@ -26,10 +26,7 @@ def extract_authors(logs):
     """
     authors_by_month = defaultdict(set)
     for commit in logs:
-        author_email = commit._author[0]
-        commit_date = datetime.fromtimestamp(commit._when)
-        month_key = f"{commit_date.year}-{commit_date.month}"
-        authors_by_month[month_key].add(author_email)
+        authors_by_month[month_key(commit._when)].add(commit._author[0])
     return authors_by_month
 
 
@@ -78,11 +75,14 @@ def write_monthly_author_statistics_to_file(author_stats, fname='authors_by_mont
         sp_run(['open', fname])
 
 
-def monthly_active_developers():
+def monthly_active_developers(cwd=None):
     """
     Main function to calculate and write monthly active developers statistics.
+
+    Args:
+        cwd (str, optional): Repository directory. Defaults to the current working directory.
     """
-    logs = git_log()
+    logs = cached_git_log(cwd=cwd)
     logging.debug('Logs: %s', format_git_logs_as_string(logs))
 
     authors_by_month = extract_authors(logs)
@@ -1,10 +1,10 @@
-from datetime import datetime
 import logging
-from src.git_ir import git_log, format_git_logs_as_string
+from src.git_ir import cached_git_log, format_git_logs_as_string
 from collections import defaultdict
 from io import StringIO
 from subprocess import run as sp_run
 from src.util.git_util import git_run
+from src.util.date_util import month_key
 
 # Logging configuration
 logging.basicConfig(
@@ -12,12 +12,13 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
-def extract_commit_data(logs):
+def extract_commit_data(logs, cwd=None):
     """
     Extract commit data and count commits containing specific keywords.
 
     Args:
         logs (list): List of commit logs.
+        cwd (str, optional): Repository directory. Defaults to the current working directory.
 
     Returns:
         dict: Dictionary with months as keys and tuples (total commits, fix commits) as values.
@@ -26,18 +27,17 @@ def extract_commit_data(logs):
     keywords = {"revert", "hotfix", "bugfix", "bug", "fix", "problem", "issue"}
 
     for commit in logs:
-        commit_date = datetime.fromtimestamp(commit._when)
-        month_key = f"{commit_date.year}-{commit_date.month}"
-        total_commits, fix_commits = data_by_month[month_key]
+        key = month_key(commit._when)
+        total_commits, fix_commits = data_by_month[key]
 
         # Extract commit message
-        commit_message = git_run('log', '-n', '1', '--format=%B', commit).stdout.strip().lower()
+        commit_message = git_run('log', '-n', '1', '--format=%B', commit, cwd=cwd).stdout.strip().lower()
 
         # Check for keywords in commit message
         if any(keyword in commit_message for keyword in keywords):
             fix_commits += 1
 
-        data_by_month[month_key] = (total_commits + 1, fix_commits)
+        data_by_month[key] = (total_commits + 1, fix_commits)
 
     return data_by_month
 
@@ -92,14 +92,17 @@ def write_change_failure_rate_to_file(change_failure_rates, fname='change_failur
     if fname.endswith('.csv'):
         sp_run(['open', fname])
 
-def monthly_change_failure_analysis():
+def monthly_change_failure_analysis(cwd=None):
     """
     Main function to calculate and write monthly change failure rate statistics.
+
+    Args:
+        cwd (str, optional): Repository directory. Defaults to the current working directory.
     """
-    logs = git_log()
+    logs = cached_git_log(cwd=cwd)
     logging.debug('Logs: %s', format_git_logs_as_string(logs))
 
-    data_by_month = extract_commit_data(logs)
+    data_by_month = extract_commit_data(logs, cwd=cwd)
     change_failure_rates = calculate_change_failure_rate(data_by_month)
     write_change_failure_rate_to_file(change_failure_rates)
 
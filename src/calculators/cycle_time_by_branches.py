@@ -10,6 +10,8 @@ from subprocess import run as sp_run
 from functools import partial
 from statistics import mean, median, stdev, quantiles
 import os
+import logging
+from collections import deque
 from pprint import pprint
 
 quartiles = partial(quantiles, method='inclusive', n=4)
@@ -23,14 +25,15 @@ class BranchLine:
     departure: git_obj = None
     commits: list[git_obj] = field(default_factory=list, compare=False)
     merges: list['BranchLine'] = field(default_factory=list, compare=False)
+    _cycle_cache: tuple = field(default=None, init=False, compare=False, repr=False) # Set by _cycle()
 
     def tree(self):
-        queue = [self]
+        # Breadth first over this line and its merges
+        queue = deque([self])
         while queue:
-            for branch in queue:
-                yield branch
-                queue.extend(branch.merges)
-            del queue[:]
+            branch = queue.popleft()
+            yield branch
+            queue.extend(branch.merges)
 
     def __len__(self):
         return 2 + len(self.commits)
@@ -101,15 +104,41 @@ class BranchLine:
                 m.strategy = 'narrow'
                 m.narrow(subs)
 
-    def _dot(self, res, limit, show_nodes):
+    def _dot(self, res, limit, show_nodes, names=None):
         """
         Retval res, pass in a list for all the dot-strings.
+
+        Walks this branch line and its merges depth first with an explicit stack, in the same
+        order as recursing into each merge would. 'names' caches the quoted dot name per commit
+        and can be shared with the caller.
+        """
+        if names is None:
+            names = {}
+        node = partial(self._dot_node, names)
+
+        displayed = []
+        stack = [self]
+        while stack:
+            branch = stack.pop()
+            displayed += branch._dot_branch(res, limit, show_nodes, node)
+            stack.extend(reversed(branch.merges))
+        return displayed
+
+    @staticmethod
+    def _dot_node(names, n):
+        """
+        Quoted dot name of commit n, formatted once and then remembered in 'names'.
         """
-        def node(n):
-            res = '' + n
-            return f'"{res[:7]}"'
+        name = names.get(n)
+        if name is None:
+            name = names[n] = f'"{n[:7]}"'
+        return name
 
-        print(f"# {git_sha(self.merge)} {len(res)}")
+    def _dot_branch(self, res, limit, show_nodes, node):
+        """
+        Append the dot-strings for this branch line only, not its merges.
+        """
+        logging.debug("# %s %d", self.merge, len(res))
         res.append(f"/* {self.pretty()} */")
         displayed = []
         if not self.commits:
@@ -138,9 +167,8 @@ class BranchLine:
                     else:
                         skip += 1
                 line = []
-                print("# SHOW:", show)
+                logging.debug("# SHOW: %s", show)
                 for i, n in enumerate(show):
-                    print(f"# {i} LINE ({n}):", line)
                     if isinstance(show[i], int):
                         skip = show[i]
                         if len(line) > 1:
@@ -183,8 +211,6 @@ class BranchLine:
                 res.append(f"{tmp[-1]} -> {node(self.merge)};")
                 displayed.append(node(self.merge))
 
-        for m in self.merges:
-            displayed += m._dot(res, limit, show_nodes)
         return displayed
 
     def dot(self, limit=3, fname=None):
@@ -212,9 +238,13 @@ class BranchLine:
         _merges, _departures = [], []
         _show_nodes(self, _merges, _departures)
         _show = set(_merges + _departures)
+        names = {}  # Quoted dot name per commit, each formatted once for the whole graph
+        node = partial(self._dot_node, names)
+
         res = ["digraph Branches {"]
-        displayed = self._dot(res, limit, _show)
+        displayed = self._dot(res, limit, _show, names)
         print("# Displayed:", len(displayed), list(displayed)[:3], '...')
+        displayed = set(displayed)
 
         # COLOR LONG BRANCHES
         trees = sorted([(len(t), t) for t in self.tree()], reverse=True, key=lambda x:x[0])
@@ -229,7 +259,7 @@ class BranchLine:
             for c in t:
                 last = c
                 cc = '' + c
-                c = f'"{cc[:7]}"'
+                c = node(cc)
                 if c in displayed:
                     if cc in gb:
                         print("# LABELED BRANCH", cc, gb[cc])
@@ -242,8 +272,9 @@ class BranchLine:
         for _, t in trees:
             last = None
             for c in t:
-                c = ('' + c)[:7]
-                if f'"{c}"' in displayed:
+                name = node(c)
+                c = name[1:-1]
+                if name in displayed:
                     last = c
             if last and t.commits:
                 _, ramp, work, close, total = t._cycle()
@@ -259,7 +290,7 @@ class BranchLine:
         if fname:
             fname, ext = os.path.splitext(fname)
             with open(fname + '.dot', 'wt') as fout:
-                print(*res, file=fout, sep='\n')
+                fout.write('\n'.join(res) + '\n')
             if ext != '.dot':
                 ext = ext[1:]
                 sp_run(['dot', f'-T{ext}', f'-o{fname}.{ext}', f'{fname}.dot'], check=True)
@@ -281,27 +312,49 @@ class BranchLine:
         
 
     def pretty(self, limit=3):
+        def short(c):
+            # The commits are git_obj already; cut to their display width without re-wrapping
+            return c[:c._show_] if c else ''
+
         if len(self.commits) <= limit:
-            return f"{git_sha(self.merge)} <- {[git_sha(c) for c in self.commits]} <- {git_sha(self.departure)}"
+            return f"{short(self.merge)} <- [{', '.join(map(short, self.commits))}] <- {short(self.departure)}"
 
-        return (f"{git_sha(self.merge)} <- [{git_sha(self.start)} ..({len(self.commits)-2}).. "
-                f"{git_sha(self.commits[-1])}] <- {git_sha(self.departure)}")
+        return (f"{short(self.merge)} <- [{short(self.start)} ..({len(self.commits)-2}).. "
+                f"{short(self.commits[-1])}] <- {short(self.departure)}")
     
     def _cycle(self):
+        # dot() and cycletime() both ask for every branch line; the commits don't change once built
+        if self._cycle_cache is not None:
+            return self._cycle_cache
         start = total = ramp = close = work = None
-        ts = [c._when for c in self]
-        if ts:
-            start = min(ts)
-            if len(ts) > 1:
-                total = max(ts) - min(ts)
-            if self.departure and self.commits:
-                ramp = min(ts[1:-1]) - self.departure._when
-            if self.merge and self.commits:
-                close = self.merge._when - max(ts[1:-1])
-            if self.commits:
-                work = max(ts[1:-1]) - min(ts[1:-1])
+        # One pass for the extremes of all times and of the inner ones (without the first and last)
+        n = len(self.commits) + bool(self.merge) + bool(self.departure)
+        lo = lo_in = float('inf')
+        hi = hi_in = float('-inf')
+        for i, c in enumerate(self):
+            w = c._when
+            if w < lo:
+                lo = w
+            if w > hi:
+                hi = w
+            if 0 < i < n - 1:
+                if w < lo_in:
+                    lo_in = w
+                if w > hi_in:
+                    hi_in = w
+        if n:
+            start = lo
+            if n > 1:
+                total = hi - lo
+            if n > 2 and self.commits:
+                if self.departure:
+                    ramp = lo_in - self.departure._when
+                if self.merge:
+                    close = self.merge._when - hi_in
+                work = hi_in - lo_in
         # print(start, ramp, work, close, total)
-        return start, ramp, work, close, total
+        self._cycle_cache = (start, ramp, work, close, total)
+        return self._cycle_cache
     
     def cycletime(self, fname=None, bucket_size=None):
         def ts(d,b=None):
@@ -318,20 +371,14 @@ class BranchLine:
                 m = ((d//60) % 60) / 60.0
                 return f"{h+m:.1f}h"
             return f"{int(d):,d}d {h}h"
+
+        # The spread needs two branches; a trailing bucket of one reports nan instead of raising
+        def p75(xs):
+            return quartiles(xs)[2] if len(xs) > 1 else float('nan')
+
+        def std(xs):
+            return stdev(xs) if len(xs) > 1 else float('nan')
         
-        def flip_cycle(cycles):
-            ss, rr, ww, cc, tt = [], [], [], [], []
-            for s, r, w, c, t in cycles:
-                ss.append(s)
-                rr.append(r)
-                ww.append(w)
-                cc.append(c)
-                tt.append(t)
-            return ss, rr, ww, cc, tt
-
-        _gb = git_branches()
-        _trees = sorted([(len(t), t) for t in self.tree()], reverse=True, key=lambda x:x[0])
-       
         span = [(t._cycle(), t) for t in self.tree()]
         span = [t for t in span if t[1].commits and t[0][1]] # Make sure we have ramp
         pprint([s for s, _ in span])
@@ -347,7 +394,7 @@ class BranchLine:
               "std COMMITS, std CYCLETIME, std QA, std WORKTIME,", file=buf)
         for i in range(0, len(span), step):
             sub = span[i:i+step]
-            ss, rr, ww, cc, tt = flip_cycle(c for c, _ in sub)
+            ss, rr, ww, cc, tt = zip(*(c for c, _ in sub))
             rr = [round(i/3600/24,2) for i in rr]
             ww = [round(i/3600/24,2) for i in ww]
             cc = [round(i/3600/24,2) for i in cc]
@@ -355,11 +402,12 @@ class BranchLine:
             wt = [(r or 0)//2 + (w or 0) for r,w in zip(rr, ww)] # Half ramp + work time
             ct = [(t or 0) - (r or 0)//2 for r,t in zip(rr, tt)] # Total - half ramp 
             com = [len(t.commits) for _, t in sub]
+            # statistics keeps the report as before: exact means, and int results for the int commit counts
             print(time.ctime(ss[0]), len(sub), sum(com), 
                   *[round(v,2) for v in [median(com), median(ct), median(cc), median(wt),
-                                         quartiles(com)[2], quartiles(ct)[2], quartiles(cc)[2], quartiles(wt)[2],
+                                         p75(com), p75(ct), p75(cc), p75(wt),
                                          mean(com), mean(ct), mean(cc), mean(wt),
-                                         stdev(com), stdev(ct), stdev(cc), stdev(wt)]],
+                                         std(com), std(ct), std(cc), std(wt)]],
                   sep=',', file=buf)
         if fname is None:
             print(buf.getvalue())
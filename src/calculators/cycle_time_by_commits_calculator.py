@@ -1,7 +1,7 @@
 from datetime import datetime
 from io import StringIO
 import time
-from src.git_ir import all_objects, git_log, git_obj, format_git_logs_as_string
+from src.git_ir import all_objects, cached_git_log, git_obj, format_git_logs_as_string
 from src.util.git_util import git_run
 from subprocess import run as sp_run
 import numpy as np
@@ -81,7 +81,8 @@ def commit_statistics_normalized_by_month(time_deltas):
     # iterate through sorted_deltas and assign each to the appropriate month in month_buckets
     for delta in sorted_deltas:
         logging.debug('======= delta =======: \n%s', delta)
-        month_year = (str(datetime.fromtimestamp(delta[0]).year)+"-"+str(datetime.fromtimestamp(delta[0]).month))
+        delta_date = datetime.fromtimestamp(delta[0])
+        month_year = f"{delta_date.year}-{delta_date.month}"
         logging.debug('======= month_year =======: \n%s', month_year)
         if month_year != current_month:
             current_month = month_year
@@ -132,7 +133,7 @@ def write_commit_statistics_to_file(commit_stats, fname='a.csv'):
         sp_run(['open', fname])
 
 
-def cycle_time_between_commits_by_author(bucket_size=1000):
+def cycle_time_between_commits_by_author(bucket_size=1000, cwd=None):
     """
     Calculate and analyze the cycle time between commits made by author to the main branch.
 
@@ -140,11 +141,12 @@ def cycle_time_between_commits_by_author(bucket_size=1000):
         fname (str, optional): The name of the output CSV file to save the analysis results. Defaults to 'a.csv'.
         bucket_size (int, optional): The size of the time buckets for grouping commits. Defaults to 1000.
         window_size (int, optional): The size of the moving window for calculating percentiles and standard deviation. Defaults to 250.
+        cwd (str, optional): Repository directory. Defaults to the current working directory.
 
     Returns:
         str: A CSV-formatted string containing the analysis results.
     """
-    logs = git_log()
+    logs = cached_git_log(cwd=cwd)
     logging.debug('======= logs =======: \n%s', logs)
     
     formatted_logs = format_git_logs_as_string(logs)
@@ -1,8 +1,7 @@
-from datetime import datetime
 import logging
-from src.git_ir import git_log, format_git_logs_as_string
+from src.git_ir import cached_git_log, format_git_logs_as_string
+from src.util.date_util import month_key
 from collections import defaultdict
-from io import StringIO
 from subprocess import run as sp_run
 
 # Logging configuration
@@ -23,12 +22,10 @@ def extract_commits_and_authors(logs):
     """
     data_by_month = defaultdict(lambda: (set(), 0))
     for commit in logs:
-        author_email = commit._author[0]
-        commit_date = datetime.fromtimestamp(commit._when)
-        month_key = f"{commit_date.year}-{commit_date.month}"
-        authors_set, commit_count = data_by_month[month_key]
-        authors_set.add(author_email)
-        data_by_month[month_key] = (authors_set, commit_count + 1)
+        key = month_key(commit._when)
+        authors_set, commit_count = data_by_month[key]
+        authors_set.add(commit._author[0])
+        data_by_month[key] = (authors_set, commit_count + 1)
     return data_by_month
 
 def calculate_throughput(data_by_month):
@@ -59,34 +56,39 @@ def throughput_stats_to_string(throughput_stats):
     Returns:
         str: CSV-formatted string.
     """
-    buf = StringIO()
-    print("Month,Commits Per Unique Developer", file=buf)
-    for month, throughput in sorted(throughput_stats.items()):
-        print(f"{month},{throughput:.2f}", file=buf)
-    return buf.getvalue()
+    rows = [f"{month},{throughput:.2f}" for month, throughput in sorted(throughput_stats.items())]
+    return "\n".join(["Month,Commits Per Unique Developer", *rows]) + "\n"
 
-def write_throughput_stats_to_file(throughput_stats, fname='throughput_by_month.csv'):
+def write_throughput_stats_to_file(throughput_stats, fname='throughput_by_month.csv', open_after=False):
     """
     Write the throughput statistics to a file.
 
     Args:
         throughput_stats (dict): Dictionary with months as keys and throughput values as values.
         fname (str): Filename for the output.
+        open_after (bool): Open the CSV with the system viewer once written. Off by default so batch runs
+            don't spawn a process per file.
     """
     stats_string = throughput_stats_to_string(throughput_stats)
     with open(fname, 'wt') as fout:
         fout.write(stats_string)
-    if fname.endswith('.csv'):
+    if open_after and fname.endswith('.csv'):
         sp_run(['open', fname])
 
-def monthly_throughput_analysis():
+def monthly_throughput_analysis(open_after=False, cwd=None):
     """
     Main function to calculate and write monthly throughput statistics.
+
+    The parsed git log is cached on disk and reused until the repository refs or reflogs change.
+
+    Args:
+        open_after (bool): Open the written CSV with the system viewer.
+        cwd (str, optional): Repository directory. Defaults to the current working directory.
     """
-    logs = git_log()
+    logs = cached_git_log(cwd=cwd)
     logging.debug('Logs: %s', format_git_logs_as_string(logs))
 
     data_by_month = extract_commits_and_authors(logs)
     throughput_stats = calculate_throughput(data_by_month)
-    write_throughput_stats_to_file(throughput_stats)
+    write_throughput_stats_to_file(throughput_stats, open_after=open_after)
 
@@ -1,15 +1,20 @@
-from collections import defaultdict
-from src.util.git_util import git_run
-from dataclasses import dataclass, field
-from subprocess import run as sp_run
-import time
-from functools import partial
-from statistics import mean, median, stdev, quantiles
-from io import StringIO
+from bisect import bisect_left
+import weakref
+from src.util.git_util import git_run, git_run_stream, git_cat_file
+from subprocess import CalledProcessError
 import os
-from pprint import pprint
+import re
+import logging
+import hashlib
+import pickle
 
-quartiles = partial(quantiles, method='inclusive', n=4)
+# On-disk cache used by 'cached_git_log'
+GIT_LOG_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'git_calculator')
+GIT_LOG_CACHE_MAX_ENTRIES = 32
+GIT_LOG_CACHE_VERSION = 1  # Bump when the cached row format changes
+
+# "Name <email> 1700000000 +0000", the value of a commit's author and committer headers
+_IDENT_RE = re.compile(r'^(?P<name>[^<]*?)\s*(?:<(?P<email>[^>]*)>\s+)?(?P<ts>\d+)\s+[-+]\d{4}$')
 
 class git_sha(str):
     """
@@ -20,7 +25,8 @@ class git_sha(str):
     of Git SHA hash objects based on common prefixes among instances.
 
     Attributes:
-        __all_gitsha__ (set): A set to store all instances of the gitsha class.
+        __all_gitsha__ (WeakValueDictionary): The live instance for each SHA string. Creating a gitsha
+            for a SHA that already has one returns that instance, so each SHA is held in memory once.
 
     Args:
         sha (str): The Git SHA hash string.
@@ -34,14 +40,21 @@ class git_sha(str):
         __repr__(self): Return a string representation of the gitsha with a length of _show_.
         calibrate_min(cls): Calibrate the display length of gitsha objects with common prefixes.
     """
-    # Set to store all instances of the gitsha class
-    __all_gitsha__ = set()
+    __slots__ = ('_show_', '__weakref__')  # No per-instance __dict__; weakref slot for __all_gitsha__
+
+    # Canonical instance per SHA string; entries go away once nothing else references them
+    __all_gitsha__ = weakref.WeakValueDictionary()
 
     def __new__(cls, sha):
         sha = sha or ''  # Strip the None
+        res = cls.__all_gitsha__.get(sha)
+        if isinstance(res, cls):
+            return res  # Interned
+        show = res._show_ if res is not None else 4
         res = super().__new__(cls, sha)
-        res._show_ = 4
-        cls.__all_gitsha__.add(res)
+        res._show_ = show
+        # A subclass instance (git_obj) replaces a plain gitsha as the canonical one
+        cls.__all_gitsha__[sha] = res
         return res
 
     def __str__(self):
@@ -52,44 +65,32 @@ class git_sha(str):
     
     @classmethod
     def get_instance(cls, sha_value):
-        """Retrieve a gitsha instance by its SHA value."""
-        # Iterate through the set of stored instances and find the one with the matching value.
-        for instance in cls.__all_gitsha__:
-            if instance == sha_value:
-                return instance
-        return None  # Return None if no instance matches the value.
+        """Retrieve a gitsha instance by its SHA value, or None if there is none."""
+        return cls.__all_gitsha__.get(sha_value)
 
     @classmethod
     def calibrate_min(cls):
-        # Flag to track whether we need another pass to check for duplicates
-        need_another_pass = True
-
-        while need_another_pass:
-            # Reset the flag for each pass
-            need_another_pass = False
-
-            # Dictionary to store the initial part of the sha and the corresponding full objects
-            sha_dict = defaultdict(list)
-
-            # Populate the dictionary with the current _show_ state
-            for sha in cls.__all_gitsha__:
-                current_prefix = sha[:sha._show_]
-                sha_dict[current_prefix].append(sha)
-
-            # Check for duplicates and adjust _show_ accordingly
-            for prefix_group in sha_dict.values():
-                if len(prefix_group) > 1:
-                    # If we found duplicates, we plan for another checking pass
-                    need_another_pass = True
-
-                    # Since these are duplicates, increase their _show_ attribute
-                    for item in prefix_group:
-                        item._show_ += 1  # This will affect their representation in the next pass
+        """
+        Widen the display length of every gitsha until each one is unique.
 
-        # The loop continues until there are no duplicates, ensuring all shas are unique with their _show_ state.
+        In sorted order a SHA shares its longest prefix with one of its neighbours, so the shortest
+        unique prefix is one past the longest common prefix with either neighbour. One sort plus one
+        linear scan replaces repeated regrouping passes. Display lengths only ever grow.
+        """
+        shas = sorted(cls.__all_gitsha__.values())
+        # lcps[i] is the common prefix length of shas[i] and shas[i + 1]
+        lcps = [len(os.path.commonprefix((a, b))) for a, b in zip(shas, shas[1:])]
+        for i, sha in enumerate(shas):
+            left = lcps[i - 1] if i else 0
+            right = lcps[i] if i < len(lcps) else 0
+            sha._show_ = max(sha._show_, left + 1, right + 1)
 
 class git_obj(git_sha):
+    __slots__ = ('_type', '_when', '_author', '_tree', '_children', '_parents')
+
     __all_obj__ = {}
+    __sorted_keys__ = None  # Sorted keys of __all_obj__ for prefix lookups, rebuilt lazily
+    __prefixes__ = {}  # Abbreviated SHA -> full SHA, valid while __sorted_keys__ is
 
     def __new__(cls, sha):
         """
@@ -107,119 +108,249 @@ class git_obj(git_sha):
             The newly created 'git_obj' instance.
         """
         res = super().__new__(cls, sha)
+        if sha not in cls.__all_obj__:
+            git_obj.__sorted_keys__ = None
+            git_obj.__prefixes__.clear()
         cls.__all_obj__[sha] = res
         return res
     
-    def _link(self):
+    def _link(self, get=None):
         """
         Identifies and links parent objects to their children, establishing a bidirectional
         relationship in the Git history graph.
 
-        Ensures that the current object is registered as a child of each of its parents.
+        Registers the current object as a child of each of its parents, and makes '_parents' hold
+        the canonical parent objects rather than plain SHAs. Called once per object by
+        'link_children', which clears the children lists and loads the parents first, so parents
+        are plain dict lookups and no duplicate check is needed.
+
+        Parameters:
+        -----------
+        get : callable, optional
+            Lookup from SHA to loaded 'git_obj' or None; defaults to '__all_obj__.get'.
         """
+        if get is None:
+            get = git_obj.__all_obj__.get
+        parents = []
         for p in self._parents:
-            try:
-                p = self.obj(p)
-                if self not in p._children:
-                    p._children.append(self)
-            except KeyError:
-                pass
+            o = get(p)
+            if o is not None:
+                o._children.append(self)
+                p = o
+            parents.append(p)
+        self._parents = tuple(parents)
 
     @classmethod
-    def link_children(cls):
+    def link_children(cls, cwd=None):
         """
         Iterates through all instantiated 'git_obj' objects and ensures they are properly linked
         to their parent objects. This method helps in building the complete Git history graph.
+
+        Parents that are not loaded yet are fetched in a single batch up front rather than one
+        round trip per parent. Children lists are rebuilt from scratch, so linking again is safe.
+
+        Parameters:
+        -----------
+        cwd : str, optional
+            Repository to read missing parents from. Defaults to the current working directory.
         """
+        objs = list(cls.__all_obj__.values())
+        cls.obj_many({p for o in objs for p in o._parents if p not in cls.__all_obj__}, cwd=cwd)
         for o in cls.__all_obj__.values():
-            o._link()
+            o._children = []
+        get = cls.__all_obj__.get
+        for o in objs:
+            o._link(get)
 
     @classmethod    
-    def _from_cat_file(cls, sha):
+    def _from_cat_file(cls, sha, cwd=None):
         """
-        Generates a 'git_obj' instance based on the content extracted from the 'git cat-file' command,
-        parsing necessary information such as tree, parents, and author details.
+        Generates a 'git_obj' instance based on the content extracted from the shared 'git cat-file --batch'
+        process, parsing necessary information such as tree, parents, and committer details.
 
         Parameters:
         -----------
         sha : str
             The unique SHA hash for a Git object.
+        cwd : str, optional
+            Repository directory. Defaults to the current working directory.
 
         Returns:
         --------
         git_obj
             The newly created 'git_obj' instance with properties extracted from 'git cat-file'.
         """
-        cmd = git_run('cat-file','-p', sha)
+        sha, tree, parents, _author, committer = cls._parse_headers(sha, git_cat_file.for_repo(cwd).get(sha))
         res = git_obj(sha)
-
-        tree = auth = None
-        res._parents = []
-        for line in cmd.stdout.splitlines():
-            denom, _ ,line = line.strip().partition(' ')
-            if denom == 'tree':
-                tree = line
-            elif denom == 'parent':
-                res._parents.append(line)
-            elif denom == 'committer':
-                line, timestamp, _tz = line.rsplit(' ', 5)
-                res._when = int(timestamp)  # TODO: Do something with tz
-                if line.endswith('>'):
-                    auth, _, email= line[:-1].partition('<')
-                    auth = auth.strip()
-                    res._author = (auth, email)
-                else:
-                    res._author = (line.strip(), None)
-
+        res._type = '<<' if len(parents) > 1 else '<'
+        res._tree = git_sha(tree)
+        res._children = []
+        res._parents = tuple(map(git_sha, parents))
+        auth, email, res._when = committer  # TODO: Do something with tz
+        res._author = (auth, email)
 
         logging.debug('======= res in _from_cat_file =======: \n%s', res)
         return res
 
     @classmethod
-    def _from_show(cls, sha):       
+    def _from_show(cls, sha, obj=None, cwd=None):
         """
-        Constructs a 'git_obj' instance based on the output of the 'git show' command. It parses the
-        command's output to extract detailed commit information.
+        Constructs a 'git_obj' instance with the same fields 'git log' reports (committer time, author
+        email and name), reading the commit through the shared 'git cat-file --batch' process instead
+        of spawning 'git show' per commit.
 
         Parameters:
         -----------
         sha : str
-            The unique SHA hash for a Git object.
+            The unique SHA hash for a Git object, full or abbreviated.
+        obj : tuple, optional
+            The commit as already read by 'git_cat_file.get'; read now if not given.
+        cwd : str, optional
+            Repository directory. Defaults to the current working directory.
 
         Returns:
         --------
         git_obj
             The 'git_obj' instance initialized with commit details.
-        """ 
-        cmd = git_run('show', r'--format=%ct|%H|%T|%P|%ae|%an', '-s', ''+sha)
-        line = cmd.stdout.strip()
-        parts = line.split('|', 5)
-        parts[3] = parts[3].split()  # Multiple parents
-        return git_obj.commit(*parts)
+        """
+        if obj is None:
+            obj = git_cat_file.for_repo(cwd).get(sha)
+        sha, tree, parents, author, committer = cls._parse_headers(sha, obj)
+        author_name, author_email, _ = author
+        return git_obj.commit(committer[2], sha, tree, parents, author_email, author_name)
+
+    @staticmethod
+    def _parse_headers(sha, obj):
+        """
+        Splits the header of a commit read from 'git cat-file --batch'.
+
+        Parameters:
+        -----------
+        sha : str
+            The name the object was requested by, used in the error.
+        obj : tuple or None
+            A (sha, type, contents) result from 'git_cat_file.get'.
+
+        Returns:
+        --------
+        tuple
+            (full sha, tree sha, list of parent shas, author, committer), where author and committer
+            are (name, email, timestamp) tuples.
+
+        Raises:
+        -------
+        KeyError
+            If the object is missing, ambiguous or not a commit.
+        """
+        if obj is None or obj[1] != 'commit':
+            raise KeyError(sha)
+        sha, _, body = obj
+
+        tree = author = committer = None
+        parents = []
+        header, _, _message = body.partition(b'\n\n')  # The headers end at the first blank line
+        for line in header.split(b'\n'):
+            # Match the raw header prefixes; only the values that are kept get decoded
+            if line.startswith(b'tree '):
+                tree = line[5:].decode()
+            elif line.startswith(b'parent '):
+                parents.append(line[7:].decode())
+            elif line.startswith(b'author '):
+                m = _IDENT_RE.match(line[7:].decode('utf-8', 'replace'))
+                author = (m['name'], m['email'], int(m['ts']))
+            elif line.startswith(b'committer '):
+                m = _IDENT_RE.match(line[10:].decode('utf-8', 'replace'))
+                committer = (m['name'], m['email'], int(m['ts']))
+        return sha, tree, parents, author, committer
 
     @classmethod
-    def obj(cls, sha):
+    def obj(cls, sha, cwd=None):
         """
         Retrieves the 'git_obj' instance corresponding to the given SHA if it exists. Otherwise, it
-        tries to generate the 'git_obj' from existing data or by using the 'git show' command.
+        tries to generate the 'git_obj' from existing data or by reading it from 'git cat-file --batch'.
 
         Parameters:
         -----------
         sha : str
             The unique SHA hash for a Git object.
+        cwd : str, optional
+            Repository directory. Defaults to the current working directory.
 
         Returns:
         --------
         git_obj
             The corresponding 'git_obj' instance.
+
+        Raises:
+        -------
+        KeyError
+            If the SHA is missing, ambiguous or not a commit.
+        """
+        return cls.obj_many([sha], cwd=cwd)[sha]
+
+    @classmethod
+    def obj_many(cls, shas, cwd=None):
+        """
+        Batch version of 'obj'. Known objects are returned directly; all the others are read in
+        one pipelined burst through the shared 'git cat-file --batch' process.
+
+        Parameters:
+        -----------
+        shas : iterable of str
+            Full or abbreviated SHA hashes.
+        cwd : str, optional
+            Repository directory. Defaults to the current working directory.
+
+        Returns:
+        --------
+        dict
+            Maps each requested SHA to its 'git_obj'. SHAs that are missing, ambiguous or not
+            commits are left out.
+        """
+        res = {}
+        missing = []
+        for sha in shas:
+            o = cls._known(sha)
+            if o is None:
+                missing.append(sha)
+            else:
+                res[sha] = o
+        if missing:
+            for sha, obj in zip(missing, git_cat_file.for_repo(cwd).get_many(missing)):
+                try:
+                    res[sha] = cls._from_show(sha, obj, cwd)
+                except KeyError:
+                    pass
+        return res
+
+    @classmethod
+    def _known(cls, sha):
+        """
+        Returns the already loaded 'git_obj' matching the full or abbreviated SHA, or None.
+
+        Abbreviations are resolved by bisecting a sorted copy of the known SHAs, which is rebuilt
+        only after new objects have been added. Resolved abbreviations are remembered until then,
+        so a parent referenced by many children is only searched for once. An abbreviation matching
+        more than one known SHA gives None, leaving git to report it as ambiguous.
         """
         try:
             return cls.__all_obj__[sha]
         except KeyError:
-            for k, v in cls.__all_obj__.items():
-                if k.startswith(sha):
-                    return v
-            return cls._from_show(sha)
+            pass
+        if len(sha) >= len(next(iter(cls.__all_obj__), '')):
+            return None  # As long as the known SHAs, so not an abbreviation of any of them
+        full = git_obj.__prefixes__.get(sha)
+        if full is None:
+            keys = git_obj.__sorted_keys__
+            if keys is None:
+                keys = git_obj.__sorted_keys__ = sorted(cls.__all_obj__)
+            i = bisect_left(keys, sha)
+            if i == len(keys) or not keys[i].startswith(sha):
+                return None
+            if i + 1 < len(keys) and keys[i + 1].startswith(sha):
+                return None  # Ambiguous
+            full = git_obj.__prefixes__[sha] = keys[i]
+        return cls.__all_obj__.get(full)
     
     @classmethod
     def commit(cls, commit_time, commit_hash, tree_hash, parent_hashs, author_email, author_name):
@@ -253,7 +384,7 @@ class git_obj(git_sha):
         res._author = (author_email, author_name)
         res._tree = git_sha(tree_hash)
         res._children = []
-        res._parents = tuple(git_sha(p) for p in parent_hashs)
+        res._parents = tuple(map(git_sha, parent_hashs))  # Interned: known SHAs come back as is
         return res
             
     def __repr__(self):
@@ -267,15 +398,12 @@ class git_obj(git_sha):
             A string representation of the 'git_obj' instance.
         """        
         auth = self._author[0] if '@' in self._author[0] else repr(self._author[1])
-        par = ''
-        if len(self._parents) > 1:
-            par = ','.join(repr(p) for p in self._parents)
-        elif len(self._parents) == 1:
-            par = repr(self._parents[0]) 
+        # Short SHAs only: the parents are git_obj too, and their repr would recurse into the history
+        par = ','.join(map(str, self._parents))
         return f"{self!s} {self._type} {par} {auth}"
     
 
-def all_objects():
+def all_objects(cwd=None):
     """
     Retrieve a list of unique Git objects (e.g., commits, blobs, trees) present in the entire Git repository.
 
@@ -283,6 +411,9 @@ def all_objects():
     reachable from any branch or reference in the repository. It then processes the output to extract and return
     a list of unique Git object hashes.
 
+    Args:
+        cwd (str, optional): Repository directory. Defaults to the current working directory.
+
     Returns:
         list of str: A list containing the unique Git object hashes found in the repository.
 
@@ -290,12 +421,72 @@ def all_objects():
         >>> all_objects()
         ['d1a7f4b29c79a11f08f2cdac7fe13c3d9ec19025', '6a2e78cf73ea38c614f96e8950a245b52ad7fe7c']
     """
-    cmd = git_run('rev-list', '--all', '--objects')
-    res = {git_sha(line.split()[0]): None for line in cmd.stdout.splitlines()}
-    res = list(res.keys())  # Sorted uniq
+    shas = {}  # Uniq on raw bytes, keeping order
+    for line in git_run_stream('rev-list', '--all', '--objects', cwd=cwd):
+        # '<sha>' or '<sha> <path>'; a ref can point straight at a tree or blob, so no line is special
+        shas[line.split(None, 1)[0]] = None
+    return [git_sha(sha.decode('ascii')) for sha in shas]
+
+def _git_log_rows(cwd=None):
+    """
+    Stream 'git log' over all refs and reflogs and split each line into the fields 'git_obj.commit' expects.
+
+    Args:
+        cwd (str, optional): Repository directory. Defaults to the current working directory.
+
+    Returns:
+        list of tuple: One (commit_time, commit_hash, tree_hash, parent_hashs, author_email, author_name)
+        row per commit, with the time already an int.
+    """
+    rows = []
+    append = rows.append
+    for line in git_run_stream('log','--all','--reflog',r'--format=%ct|%H|%T|%P|%ae|%an', cwd=cwd):
+        ct, ch, th, ps, ae, an = line.decode('utf-8', 'replace').rstrip('\n').split('|', 5)
+        append((int(ct), ch, th, ps.split(), ae, an))  # Multiple parents
+    return rows
+
+def _git_log_from_rows(rows, cwd=None):
+    """
+    Build linked and calibrated 'git_obj' commits from rows produced by '_git_log_rows'.
+
+    Commits are linked while they are built: a parent already seen gets the child right away,
+    otherwise the child waits for the parent's row (git log lists children first). Only parents
+    outside the log are looked up afterwards, in one batch, in the repository at 'cwd'.
+    """
+    def repoint(child, parent):
+        child._parents = tuple(parent if p == parent else p for p in child._parents)
+
+    res = []
+    seen = {}
+    waiting = {}  # Parent SHA -> children listed before it
+    for parts in rows:
+        c = git_obj.commit(*parts)
+        c._children = waiting.pop(c, [])
+        for child in c._children:
+            repoint(child, c)
+        parents = []
+        for p in c._parents:
+            o = seen.get(p)
+            if o is None:
+                waiting.setdefault(p, []).append(c)
+            else:
+                o._children.append(c)
+                p = o
+            parents.append(p)
+        c._parents = tuple(parents)
+        seen[c] = c
+        res.append(c)
+
+    for p, o in git_obj.obj_many(waiting, cwd=cwd).items():  # Parents outside the log, e.g. loaded before
+        linked = set(o._children)
+        for child in waiting[p]:
+            if child not in linked:
+                o._children.append(child)
+            repoint(child, o)
+    git_sha.calibrate_min()
     return res
 
-#def git_log():
+def git_log(cwd=None):
     """
     Retrieve and parse Git commit log entries from the entire Git repository.
 
@@ -305,6 +496,9 @@ def all_objects():
 
     After parsing, it links parent-child relationships between commits and calibrates the minimum SHA hash length.
 
+    Args:
+        cwd (str, optional): Repository directory. Defaults to the current working directory.
+
     Returns:
         list of GitCommit: A list containing parsed Git commit objects representing the commit history.
 
@@ -326,18 +520,66 @@ def all_objects():
             ...
         ]
     """
-def git_log():
-    def to_obj(line):
-        parts = line.split('|', 5)
-        parts[3] = parts[3].split()  # Multiple parents
-        return git_obj.commit(*parts)
-    res = [
-        to_obj(line)
-        for line in git_run('log','--all','--reflog',r'--format=%ct|%H|%T|%P|%ae|%an').stdout.splitlines()
-    ]
-    git_obj.link_children()
-    git_sha.calibrate_min()
-    return res
+    return _git_log_from_rows(_git_log_rows(cwd), cwd)
+
+def cached_git_log(cache_dir=None, max_entries=GIT_LOG_CACHE_MAX_ENTRIES, cwd=None):
+    """
+    Same as 'git_log', but reuses the parsed log from an on-disk cache when the repository has not changed.
+
+    'git_log' reads every ref and every reflog entry, so the cache key hashes both: the output of
+    'git show-ref --head' (HEAD plus every branch and tag tip) and of 'git reflog --all' (the commit of
+    every reflog entry), together with GIT_LOG_CACHE_VERSION. Entries live in '<cache_dir>/<repo>/<key>.pkl',
+    one directory per repository, and only the 'max_entries' most recently written entries are kept per
+    repository. A repository without commits gives an empty list and is not cached.
+
+    Args:
+        cache_dir (str, optional): Root directory of the cache. Defaults to GIT_LOG_CACHE_DIR,
+            '~/.cache/git_calculator', looked up at call time.
+        max_entries (int): Number of cached logs to keep per repository.
+        cwd (str, optional): Repository directory. Defaults to the current working directory.
+
+    Returns:
+        list of git_obj: The same commits 'git_log' returns.
+    """
+    if cache_dir is None:
+        cache_dir = GIT_LOG_CACHE_DIR
+    git_dir = git_run('rev-parse', '--absolute-git-dir', cwd=cwd).stdout.strip()
+    try:
+        refs = git_run('show-ref', '--head', cwd=cwd).stdout
+    except CalledProcessError as e:
+        if e.returncode != 1:
+            raise
+        refs = ''  # No refs at all
+    reflog = git_run('reflog', '--all', '--format=%H', cwd=cwd).stdout
+    if not refs and not reflog:
+        return []  # Nothing to log, as 'git_log' would find
+
+    key = hashlib.sha256(f'{GIT_LOG_CACHE_VERSION}\n{refs}\n{reflog}'.encode()).hexdigest()
+    repo_dir = os.path.join(cache_dir, hashlib.sha256(git_dir.encode()).hexdigest()[:16])
+    fname = os.path.join(repo_dir, key + '.pkl')
+
+    try:
+        with open(fname, 'rb') as fin:
+            rows = pickle.load(fin)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        rows = _git_log_rows(cwd)
+        os.makedirs(repo_dir, exist_ok=True)
+        tmp = f'{fname}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as fout:
+            pickle.dump(rows, fout, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, fname)  # Atomic, concurrent runs never see a partial file
+
+        # Bound the cache: drop the oldest entries for this repository
+        entries = sorted(
+            (os.path.join(repo_dir, f) for f in os.listdir(repo_dir) if f.endswith('.pkl')),
+            key=os.path.getmtime,
+        )
+        for old in entries[:-max_entries]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+    return _git_log_from_rows(rows, cwd)
 
 def format_git_logs_as_string(log_entries):
     """
@@ -355,31 +597,32 @@ def format_git_logs_as_string(log_entries):
     return formatted_output
 
 
-def git_branches():
+def git_branches(cwd=None):
     """
     Retrieve and parse Git branch information from the repository.
 
     This function uses Git's 'branch' command with various options to obtain information about all branches,
     including local and remote branches, in the repository. It parses each branch entry and creates a dictionary
-    where keys are branch names, and values are associated object names (e.g., commit hashes).
+    where keys are the object names the branches point at (e.g., commit hashes), and values are the full ref names.
+
+    Args:
+        cwd (str, optional): Repository directory. Defaults to the current working directory.
 
     Returns:
-        dict: A dictionary containing branch names as keys and associated object names as values.
+        dict: A dictionary containing object names as keys and associated ref names as values.
+        Branches pointing at the same commit share one entry, keeping the last ref listed.
 
     Example:
         >>> git_branches()
         {
-            'master': 'd1a7f4b29c79a11f08f2cdac7fe13c3d9ec19025',
-            'feature/branch-a': '6a2e78cf73ea38c614f96e8950a245b52ad7fe7c',
-            'origin/develop': '8d9a6d22dded20b4f6642ac21c64efab8dd9e78b',
+            'd1a7f4b29c79a11f08f2cdac7fe13c3d9ec19025': 'refs/heads/master',
+            '6a2e78cf73ea38c614f96e8950a245b52ad7fe7c': 'refs/heads/feature/branch-a',
+            '8d9a6d22dded20b4f6642ac21c64efab8dd9e78b': 'refs/remotes/origin/develop',
             ...
         }
     """
-    def to_obj(line):
-        parts = line.split(' ', 2)
-        return (parts[0], parts[2])
-    res = [
-        to_obj(line)
-        for line in git_run('branch','-al','--no-abbrev',r'--format=%(objectname) %(objecttype) %(refname)').stdout.splitlines()
-    ]
-    return dict(res)
\ No newline at end of file
+    res = {}
+    for line in git_run_stream('branch','-al','--no-abbrev',r'--format=%(objectname) %(objecttype) %(refname)', cwd=cwd):
+        objectname, _objecttype, refname = line.decode('utf-8', 'replace').rstrip('\n').split(' ', 2)
+        res[objectname] = refname
+    return res
\ No newline at end of file
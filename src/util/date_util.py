@@ -0,0 +1,14 @@
+from datetime import datetime
+
+def month_key(timestamp):
+    """
+    Build the "YYYY-M" month key the monthly calculators bucket commits by.
+
+    Args:
+        timestamp (int): Commit timestamp in seconds since the epoch.
+
+    Returns:
+        str: Month key in local time, e.g. "2023-9".
+    """
+    commit_date = datetime.fromtimestamp(timestamp)
+    return f"{commit_date.year}-{commit_date.month}"
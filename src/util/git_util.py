@@ -1,8 +1,34 @@
-from subprocess import run as sp_run
+from subprocess import run as sp_run, Popen, PIPE, CalledProcessError
+import atexit
+import threading
+import logging
+import os
 
-def git_run(*args):
+logger = logging.getLogger(__name__)
+
+
+class lazy_cmdline:
+    """
+    Command line arguments for a debug trace, joined only when the log record is formatted.
+
+    Passing this instead of "' '.join(args)" costs no join while debug logging is off, and
+    arguments that are not str, e.g. a Path, are formatted with str().
+
+    Args:
+        args (iterable): The command and its arguments.
+    """
+    __slots__ = ('args',)
+
+    def __init__(self, args):
+        self.args = args
+
+    def __str__(self):
+        return ' '.join(map(str, self.args))
+
+
+def git_run(*args, cwd=None):
     """
-    Execute a Git command with its arguments, print the command for reference,
+    Execute a Git command with its arguments, log the command at debug level,
     run it using a subprocess, capture its output, and return the result.
 
     This function allows you to interact with Git from within a Python script
@@ -11,13 +37,157 @@ def git_run(*args):
     Args:
         *args: A variable number of arguments representing the Git command
                and its options and arguments.
+        cwd (str, optional): Repository directory to run the command in.
+               Defaults to the current working directory. Passing it
+               explicitly avoids os.chdir, so several repositories can be
+               analyzed concurrently.
 
     Returns:
         CompletedProcess: An object containing information about the executed
         command, including its return code, standard output, and standard error.
     """
-    print('# $> git', *args)
-    res = sp_run(['git']+list(args), check=True, text=True, capture_output=True)
+    logger.debug('# $> git %s', lazy_cmdline(args))
+    res = sp_run(['git']+list(args), check=True, text=True, capture_output=True, cwd=cwd)
     return res
 
 
+def git_run_stream(*args, cwd=None):
+    """
+    Execute a Git command and yield its standard output line by line while it runs.
+
+    Unlike git_run the output is never buffered whole, so parsing overlaps
+    with git producing the output and memory stays flat on large repositories.
+
+    Args:
+        *args: The Git command and its options and arguments.
+        cwd (str, optional): Repository directory to run the command in.
+
+    Yields:
+        bytes: Each line of standard output, including its trailing newline.
+
+    Raises:
+        CalledProcessError: If git exits with a non-zero status.
+    """
+    logger.debug('# $> git %s', lazy_cmdline(args))
+    cmd = ['git']+list(args)
+    proc = Popen(cmd, stdout=PIPE, stderr=PIPE, cwd=cwd)
+    # Drain stderr alongside stdout, so git can't stall on a full stderr pipe
+    stderr = []
+    drain = threading.Thread(target=lambda: stderr.append(proc.stderr.read()), daemon=True)
+    drain.start()
+    try:
+        yield from proc.stdout
+        if proc.wait():
+            drain.join()
+            raise CalledProcessError(proc.returncode, cmd, stderr=stderr[0])
+    finally:
+        if proc.poll() is None:  # The caller stopped early
+            proc.kill()
+            proc.wait()
+        drain.join()
+        proc.stdout.close()
+        proc.stderr.close()
+
+
+class git_cat_file:
+    """
+    A long-running 'git cat-file --batch' process for reading objects by name.
+
+    Spawning 'git show' or 'git cat-file -p' per object costs a fork/exec and a
+    repository open on every lookup. This keeps one process per repository and
+    feeds it object names over stdin, reading the framed
+    '<sha> <type> <size>\\n<contents>\\n' responses from stdout.
+
+    Use 'git_cat_file.for_repo()' rather than the constructor so lookups against
+    the same repository share a process. All processes are closed at exit.
+    Requests are serialized by a lock, so an instance can be shared by threads.
+
+    Attributes:
+        __by_repo__ (dict): Running instances keyed by repository directory.
+
+    Example:
+        >>> git_cat_file.for_repo().get('HEAD')
+        ('d1a7f4b29c79a11f08f2cdac7fe13c3d9ec19025', 'commit', b'tree 6a2e...')
+    """
+    __by_repo__ = {}
+
+    def __init__(self, cwd=None):
+        logger.debug('# $> git cat-file --batch')
+        self._proc = Popen(['git', 'cat-file', '--batch'], stdin=PIPE, stdout=PIPE, cwd=cwd)
+        self._lock = threading.Lock()  # Keeps each request's write and framed read together
+
+    @classmethod
+    def for_repo(cls, cwd=None):
+        """Return the shared instance for the repository at 'cwd' (default: current directory)."""
+        key = os.path.realpath(cwd or os.getcwd())
+        res = cls.__by_repo__.get(key)
+        if res is None or res._proc.poll() is not None:
+            res = cls.__by_repo__[key] = cls(key)
+        return res
+
+    def get(self, name):
+        """
+        Read one object.
+
+        Args:
+            name (str): Any object name git accepts, e.g. a full or abbreviated SHA.
+
+        Returns:
+            tuple: (sha, type, contents) with contents as bytes, or None if the
+            name is missing or ambiguous.
+        """
+        with self._lock:
+            self._proc.stdin.write(name.encode() + b'\n')
+            self._proc.stdin.flush()
+            return self._read()
+
+    def get_many(self, names):
+        """
+        Read several objects in one pipelined burst.
+
+        A writer thread pushes every name into git's stdin while this thread
+        reads the responses in order, so large batches never deadlock on full
+        pipe buffers and the round trips overlap.
+
+        Args:
+            names (iterable of str): Object names, as for 'get'.
+
+        Returns:
+            list: One 'get' result per name, in the same order.
+        """
+        names = list(names)
+
+        def write():
+            for name in names:
+                self._proc.stdin.write(name.encode() + b'\n')
+            self._proc.stdin.flush()
+
+        with self._lock:
+            writer = threading.Thread(target=write, daemon=True)
+            writer.start()
+            res = [self._read() for _ in names]
+            writer.join()
+        return res
+
+    def _read(self):
+        header = self._proc.stdout.readline().split()
+        if len(header) != 3:
+            return None  # '<name> missing' or '<name> ambiguous'
+        sha, otype, size = header
+        contents = self._proc.stdout.read(int(size) + 1)[:-1]  # Drop the trailing LF
+        return sha.decode(), otype.decode(), contents
+
+    def close(self):
+        """Close stdin so git exits, then reap the process."""
+        with self._lock:
+            self._proc.stdin.close()
+            self._proc.wait()
+
+    @classmethod
+    def close_all(cls):
+        for res in cls.__by_repo__.values():
+            res.close()
+        cls.__by_repo__.clear()
+
+
+atexit.register(git_cat_file.close_all)
@@ -1,8 +1,26 @@
 import datetime
 from src.util import git_util
+from subprocess import run as sp_run, Popen, PIPE, CalledProcessError
 import os
 import logging
 
+logger = logging.getLogger(__name__)
+
+def _git_add_commit(filename, *commit_args, cwd=None, env=None):
+    """
+    Stage a file and commit it from one shell process, rather than one 'git add' and one
+    'git commit' process.
+
+    Args:
+        filename (str): The file to stage.
+        *commit_args: Arguments for 'git commit'.
+        cwd (str, optional): Repository directory. Defaults to the current working directory.
+        env (dict, optional): Environment for git, e.g. with GIT_COMMITTER_DATE set.
+    """
+    logger.debug('# $> git add %s && git commit %s', filename, git_util.lazy_cmdline(commit_args))
+    sp_run(['sh', '-c', 'git add -- "$1" && shift && exec git commit "$@"', 'sh', filename, *commit_args],
+           check=True, capture_output=True, cwd=cwd, env=env)
+
 # TODO: Refactor this next 
 def create_git_repo_with_timed_commits_and_branches(directory_to_create_repo):
 
@@ -10,11 +28,8 @@ def create_git_repo_with_timed_commits_and_branches(directory_to_create_repo):
     if not isinstance(directory_to_create_repo, str) or not os.path.isdir(directory_to_create_repo):
         raise ValueError("Invalid directory path provided: " + str(directory_to_create_repo))
 
-    # Change to the temporary directory provided
-    os.chdir(directory_to_create_repo)
-
     # Initialize a new Git repository
-    git_util.git_run('init')
+    git_util.git_run('init', cwd=directory_to_create_repo)
 
     # Define a list of authors
     authors = [
@@ -32,13 +47,11 @@ def create_git_repo_with_timed_commits_and_branches(directory_to_create_repo):
         author_name, author_email = authors[i % len(authors)]
         commit_date = start_date + datetime.timedelta(weeks=i - 1)
         topic_branch_name = f'topic-branch-{i}'
-        git_util.git_run('checkout', '-b', topic_branch_name)
+        git_util.git_run('checkout', '-b', topic_branch_name, cwd=directory_to_create_repo)
 
-        with open(f'file{i}.txt', 'w') as file:
+        with open(os.path.join(directory_to_create_repo, f'file{i}.txt'), 'w') as file:
             file.write(f'Commit {i} by {author_name}')
 
-        git_util.git_run('add', f'file{i}.txt')
-
         # Modify commit message to include 'bugfix' or 'hotfix' at certain intervals
         commit_msg = f"Commit {i} by {author_name}"
         if i % 4 == 0:  # Every 4th commit
@@ -46,10 +59,10 @@ def create_git_repo_with_timed_commits_and_branches(directory_to_create_repo):
         elif i % 3 == 0:  # Every 3rd commit
             commit_msg += " - bugfix"
 
-        git_util.git_run('commit', '-m', commit_msg, '--author', f'{author_name} <{author_email}>', '--date', commit_date.strftime('%Y-%m-%dT%H:%M:%S'))
+        _git_add_commit(f'file{i}.txt', '-m', commit_msg, '--author', f'{author_name} <{author_email}>', '--date', commit_date.strftime('%Y-%m-%dT%H:%M:%S'), cwd=directory_to_create_repo)
 
-        git_util.git_run('checkout', 'main')
-        git_util.git_run('merge', topic_branch_name)
+        git_util.git_run('checkout', 'main', cwd=directory_to_create_repo)
+        git_util.git_run('merge', topic_branch_name, cwd=directory_to_create_repo)
 
 
 class ToyRepoCreator:
@@ -93,54 +106,122 @@ class ToyRepoCreator:
         self.start_date = datetime.datetime(2023, 9, 1)
 
     def initialize_repo(self):
-        os.chdir(self.directory)
-        git_util.git_run('init')
-
-    def create_commit(self, file_index, author_name, author_email, commit_date):
-        filename = f'file{file_index}.txt'
-
-        with open(filename, 'w') as file:
-            file.write(f'Commit {file_index} by {author_name}')
-
-        git_util.git_run('add', filename)
-
-        formatted_date = commit_date.strftime('%Y-%m-%dT%H:%M:%S')
-        os.environ['GIT_COMMITTER_DATE'] = formatted_date
-        os.environ['GIT_AUTHOR_DATE'] = formatted_date
+        git_util.git_run('init', cwd=self.directory)
 
+    @staticmethod
+    def _commit_msg(file_index, author_name):
         # Modify commit message to include 'bugfix' or 'hotfix'
         commit_msg = f"Commit {file_index} by {author_name}"
         if file_index % 4 == 0:  # Every 4th commit
             commit_msg += " - hotfix"
         elif file_index % 3 == 0:  # Every 3rd commit
             commit_msg += " - bugfix"
+        return commit_msg
 
-        git_util.git_run('commit', '-m', commit_msg, '--author', f'{author_name} <{author_email}>')
+    def create_commit(self, file_index, author_name, author_email, commit_date):
+        filename = f'file{file_index}.txt'
 
-        del os.environ['GIT_COMMITTER_DATE']
-        del os.environ['GIT_AUTHOR_DATE']
+        with open(os.path.join(self.directory, filename), 'w') as file:
+            file.write(f'Commit {file_index} by {author_name}')
+
+        formatted_date = commit_date.strftime('%Y-%m-%dT%H:%M:%S')
+        env = dict(os.environ, GIT_COMMITTER_DATE=formatted_date, GIT_AUTHOR_DATE=formatted_date)
+
+        commit_msg = self._commit_msg(file_index, author_name)
+        _git_add_commit(filename, '-m', commit_msg, '--author', f'{author_name} <{author_email}>', cwd=self.directory, env=env)
+
+    def import_commits(self, commits):
+        """
+        Append commits to the current branch through one 'git fast-import' process.
+
+        Each commit adds 'file{file_index}.txt' the way create_commit does, but the whole history
+        is streamed to a single git process instead of spawning 'git add' and 'git commit' per
+        commit. The author doubles as the committer, and dates are taken in local time as with
+        create_commit. The working tree is checked out afterwards, so create_commit can follow.
+
+        Args:
+            commits (iterable of tuple): (file_index, author_name, author_email, commit_date) per commit.
+        """
+        branch = git_util.git_run('symbolic-ref', 'HEAD', cwd=self.directory).stdout.strip()
+        stream = []
+        for file_index, author_name, author_email, commit_date in commits:
+            content = f'Commit {file_index} by {author_name}'.encode()
+            msg = self._commit_msg(file_index, author_name).encode()
+            local_date = commit_date.astimezone()
+            ident = f'{author_name} <{author_email}> {int(local_date.timestamp())} {local_date:%z}'.encode()
+            stream += [b'commit %s\n' % branch.encode(),
+                       b'author %s\ncommitter %s\n' % (ident, ident),
+                       b'data %d\n%s\n' % (len(msg), msg),
+                       b'M 100644 inline file%d.txt\n' % file_index,
+                       b'data %d\n%s\n\n' % (len(content), content),
+                       b'checkpoint\n\n']  # Moves the branch, leaving a reflog entry per commit like 'git commit'
+
+        cmd = ['git', 'fast-import', '--quiet', '--date-format=raw']
+        logger.debug('# $> %s', git_util.lazy_cmdline(cmd))
+        proc = Popen(cmd, stdin=PIPE, stderr=PIPE, cwd=self.directory)
+        _, stderr = proc.communicate(b''.join(stream))
+        if proc.returncode:
+            raise CalledProcessError(proc.returncode, cmd, stderr=stderr)
+        git_util.git_run('reset', '--hard', '-q', cwd=self.directory)
 
     def create_custom_commits(self, commit_intervals):
         self.initialize_repo()
 
+        commits = []
         for i, interval in enumerate(commit_intervals, start=1):
-            logging.debug('======= i =======: \n%s', i)
+            logger.debug('======= i =======: \n%s', i)
             author_name, author_email = self.authors[i % len(self.authors)]
-            logging.debug('======= author_name =======: \n%s', author_name)
-            logging.debug('======= author_email =======: \n%s', author_email)
+            logger.debug('======= author_name =======: \n%s', author_name)
+            logger.debug('======= author_email =======: \n%s', author_email)
             commit_date = self.start_date + datetime.timedelta(days=interval)
-            logging.debug('======= commit_date =======: \n%s', commit_date)
-            self.create_commit(i, author_name, author_email, commit_date)
+            logger.debug('======= commit_date =======: \n%s', commit_date)
+            commits.append((i, author_name, author_email, commit_date))
+        self.import_commits(commits)
 
 
     def create_custom_commits_single_author(self, commit_intervals):
         self.initialize_repo()
 
+        commits = []
         for i, interval in enumerate(commit_intervals, start=1):
-            logging.debug('======= i =======: \n%s', i)
+            logger.debug('======= i =======: \n%s', i)
             author_name, author_email = self.authors[0][0], self.authors[0][1]  
-            logging.debug('======= author_name =======: \n%s', author_name)
-            logging.debug('======= author_email =======: \n%s', author_email)
+            logger.debug('======= author_name =======: \n%s', author_name)
+            logger.debug('======= author_email =======: \n%s', author_email)
             commit_date = self.start_date + datetime.timedelta(days=interval)
-            logging.debug('======= commit_date =======: \n%s', commit_date)
-            self.create_commit(i, author_name, author_email, commit_date)
+            logger.debug('======= commit_date =======: \n%s', commit_date)
+            commits.append((i, author_name, author_email, commit_date))
+        self.import_commits(commits)
+
+    def create_merged_branches(self, branches):
+        """
+        Create a main line that topic branches are merged back into, for branch cycle time.
+
+        The main line starts with one commit on start_date. Each topic branch departs from the
+        latest main line commit, gets one commit per entry of 'work_days', and is then merged
+        with '--no-ff' on 'merge_day', so every branch ends in a merge commit.
+
+        Args:
+            branches (list of tuple): (work_days, merge_day) per topic branch, in days after start_date.
+        """
+        self.initialize_repo()
+        file_index = 1
+        self.create_commit(file_index, *self.authors[file_index % len(self.authors)], self.start_date)
+        main = git_util.git_run('symbolic-ref', '--short', 'HEAD', cwd=self.directory).stdout.strip()
+
+        for b, (work_days, merge_day) in enumerate(branches, start=1):
+            topic_branch_name = f'topic-branch-{b}'
+            git_util.git_run('checkout', '-q', '-b', topic_branch_name, cwd=self.directory)
+            for day in work_days:
+                file_index += 1
+                author_name, author_email = self.authors[file_index % len(self.authors)]
+                self.create_commit(file_index, author_name, author_email, self.start_date + datetime.timedelta(days=day))
+            git_util.git_run('checkout', '-q', main, cwd=self.directory)
+
+            formatted_date = (self.start_date + datetime.timedelta(days=merge_day)).strftime('%Y-%m-%dT%H:%M:%S')
+            author_name, author_email = self.authors[0]
+            env = dict(os.environ, GIT_COMMITTER_DATE=formatted_date, GIT_AUTHOR_DATE=formatted_date,
+                       GIT_AUTHOR_NAME=author_name, GIT_AUTHOR_EMAIL=author_email)
+            logger.debug('# $> git merge --no-ff %s', topic_branch_name)
+            sp_run(['git', 'merge', '-q', '--no-ff', '-m', f'Merge {topic_branch_name}', topic_branch_name],
+                   check=True, capture_output=True, cwd=self.directory, env=env)
@@ -0,0 +1,34 @@
+import pytest
+import tempfile
+import subprocess
+from src.util.toy_repo import ToyRepoCreator
+from src.calculators.active_developers_calculator import extract_authors, monthly_author_statistics
+from src.git_ir import git_log
+
+@pytest.fixture(scope="function")
+def temp_directory():
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    subprocess.run(['rm', '-rf', temp_dir])
+
+def test_authors_by_month(temp_directory):
+    """
+    Tests the monthly bucketing of unique authors in a toy repository.
+
+    Twelve weekly commits starting September 1, 2023 rotate through four authors,
+    giving 4 authors in September, 4 in October and 3 in November. The buckets do
+    not depend on the order of the log.
+    """
+    trc = ToyRepoCreator(temp_directory)
+    trc.create_custom_commits([7 * i for i in range(12)])  # Weekly intervals for 12 weeks
+
+    logs = git_log(cwd=temp_directory)
+    authors_by_month = extract_authors(logs)
+
+    assert authors_by_month == {
+        '2023-9': {'author1@example.com', 'author2@example.com', 'author3@example.com', 'author4@example.com'},
+        '2023-10': {'author1@example.com', 'author2@example.com', 'author3@example.com', 'author4@example.com'},
+        '2023-11': {'author1@example.com', 'author3@example.com', 'author4@example.com'},
+    }
+    assert extract_authors(reversed(logs)) == authors_by_month
+    assert monthly_author_statistics(authors_by_month) == {'2023-9': 4, '2023-10': 4, '2023-11': 3}
@@ -37,8 +37,8 @@ def test_change_failure_rate(temp_directory, setup_logging):
     # Create custom commits with 'bugfix' and 'hotfix' in some commit messages
     trc.create_custom_commits([7 * i for i in range(12)])  # Weekly intervals for 12 weeks
 
-    logs = git_log()
-    commit_data = extract_commit_data(logs)
+    logs = git_log(cwd=temp_directory)
+    commit_data = extract_commit_data(logs, cwd=temp_directory)
     change_failure_rates = calculate_change_failure_rate(commit_data)
 
     # Define expected change failure rates for each month
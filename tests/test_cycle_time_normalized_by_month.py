@@ -30,7 +30,7 @@ def test_cycle_time_normalized_by_month(temp_directory):
     increasing_intervals = [10, 11, 12, 13, 34, 35, 41, 49, 60, 75, 80, 85]
     logging.debug('======= increasing_intervals =======: \n%s', increasing_intervals)
     trc.create_custom_commits_single_author(increasing_intervals)
-    logs = git_log()
+    logs = git_log(cwd=temp_directory)
     tds = calculate_time_deltas(logs)
     result = commit_statistics_normalized_by_month(tds)
 
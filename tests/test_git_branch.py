@@ -2,7 +2,9 @@ import subprocess
 import pytest
 import tempfile
 from src.util import toy_repo  
+from src.util.toy_repo import ToyRepoCreator
 from src.git_ir import all_objects, git_obj, git_log, git_branches
+from src.calculators.cycle_time_by_branches import BranchLine
 from src.util.git_util import git_run
 import logging
 
@@ -17,21 +19,35 @@ def temp_directory():
 
 def test_git_branches(temp_directory):
     """
-    # Call the function to create a Git repository with timed commits and branches
-    toy_repo.create_git_repo_with_timed_commits_and_branches(temp_directory)
-
+    Test that git_branches maps the tip commit of every local branch to its ref name.
+    """
+    trc = ToyRepoCreator(temp_directory)
+    # (work days, merge day) per topic branch
+    trc.create_merged_branches([([1, 2], 3), ([4], 6), ([7, 8], 9)])
+    main = git_run('symbolic-ref', 'HEAD', cwd=temp_directory).stdout.strip()
+    refs = [main] + [f'refs/heads/topic-branch-{b}' for b in range(1, 4)]
 
-    # Call the git_branches function on the test repository
-    branch_info = git_branches()
+    branch_info = git_branches(cwd=temp_directory)
 
     logging.debug('======= branch_info =======: \n%s', branch_info)
-    # Assert that the returned value is a dictionary
-    assert isinstance(branch_info, dict)
+    assert branch_info == {git_run('rev-parse', ref, cwd=temp_directory).stdout.strip(): ref for ref in refs}
+    assert all(len(sha) == 40 for sha in branch_info)
 
-    # Check if topic branches exist
-    for i in range(1, 13):
-        topic_branch_name = f'topic-branch-{i}'
-        assert topic_branch_name in [branch.split('/')[-1] for branch in branch_info.values()]
+def test_branch_cycletime(temp_directory):
     """
-    assert True
+    Test BranchLine.cycletime on a toy repository of six topic branches merged into the main line.
+
+    The report must stay as the statistics module formats it: the median and mean of the
+    commit counts print as whole numbers ('2', not '2.0') when they are integral.
+    """
+    trc = ToyRepoCreator(temp_directory)
+    # (work days, merge day) per topic branch
+    trc.create_merged_branches([([1, 2, 3], 5), ([6, 8], 9), ([10], 12), ([11, 13, 14], 15), ([16, 17], 20), ([18], 21)])
+    head = git_log(cwd=temp_directory)[0]
+
+    res = BranchLine(set(), 'top', head).cycletime(bucket_size=3)
 
+    assert res.splitlines()[1:] == [
+        'Fri Sep  1 00:00:00 2023,3,6,2,4.0,2.0,2.0,2.5,4.5,2.0,2.0,2,4.0,1.67,1.33,1.0,1.0,0.58,1.15',
+        'Tue Sep 12 00:00:00 2023,3,6,2,5.0,3.0,1.0,2.5,5.0,3.0,1.5,2,4.67,2.33,0.67,1.0,0.58,1.15,1.53',
+    ]
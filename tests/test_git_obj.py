@@ -3,9 +3,10 @@ import tempfile
 import logging
 import subprocess
 from src.util.toy_repo import ToyRepoCreator
-from src.git_ir import all_objects, git_obj, git_log
+from src.git_ir import all_objects, git_obj, git_log, cached_git_log
 from src.util.git_util import git_run
 import os
+import re
 
 @pytest.fixture(scope="function")
 def setup_logging():
@@ -29,7 +30,7 @@ def test_new_object_creation(temp_directory):
     trc = ToyRepoCreator(temp_directory)
     even_intervals = [7 * i for i in range(12)]  # Weekly intervals
     trc.create_custom_commits(even_intervals)
-    res = git_run('log')
+    res = git_run('log', cwd=temp_directory)
 
 
 def test_all_objects(temp_directory):
@@ -39,7 +40,7 @@ def test_all_objects(temp_directory):
     trc = ToyRepoCreator(temp_directory)
     even_intervals = [7 * i for i in range(12)]  # Weekly intervals
     trc.create_custom_commits(even_intervals)
-    result = all_objects()
+    result = all_objects(cwd=temp_directory)
 
     logging.debug('======= all_objects =======: \n%s', result)
     # Assert that the result is a list
@@ -48,6 +49,26 @@ def test_all_objects(temp_directory):
     # Assert that the result is not empty
     assert result
 
+    # Every entry is a full SHA, and together they are exactly the objects git lists
+    assert all(re.fullmatch('[0-9a-f]{40}', sha) for sha in result)
+    listed = git_run('rev-list', '--all', '--objects', cwd=temp_directory).stdout.splitlines()
+    assert sorted(result) == sorted({line.split()[0] for line in listed})
+
+def test_all_objects_tagged_blob_and_tree(temp_directory):
+    """
+    Test all_objects() on a repository whose only refs are tags on a blob and on a tree, where git
+    prints '<sha> <path>' lines from the start.
+    """
+    git_run('init', cwd=temp_directory)
+    blob = subprocess.run(['git', 'hash-object', '-w', '--stdin'], input='content\n', text=True,
+                          capture_output=True, check=True, cwd=temp_directory).stdout.strip()
+    tree = subprocess.run(['git', 'mktree'], input=f'100644 blob {blob}\tfile.txt\n', text=True,
+                          capture_output=True, check=True, cwd=temp_directory).stdout.strip()
+    git_run('tag', 'blobtag', blob, cwd=temp_directory)
+    git_run('tag', 'treetag', tree, cwd=temp_directory)
+
+    assert sorted(all_objects(cwd=temp_directory)) == sorted([blob, tree])
+
 def test_git_log(temp_directory):
     """
     Test the git_log() method.
@@ -55,9 +76,161 @@ def test_git_log(temp_directory):
     trc = ToyRepoCreator(temp_directory)
     even_intervals = [7 * i for i in range(12)]  # Weekly intervals
     trc.create_custom_commits(even_intervals)
-    commit_history = git_log()
+    commit_history = git_log(cwd=temp_directory)
     # print the result
     logging.debug('======= commit_history =======: \n%s', commit_history)
     # Perform assertions on the result
     assert isinstance(commit_history, list)
-    assert len(commit_history) > 0
\ No newline at end of file
+    assert len(commit_history) > 0
+    # Parents point at the interned commit objects
+    for commit in commit_history:
+        for parent in commit._parents:
+            assert parent is git_obj.obj(parent)
+            assert commit in parent._children
+    # The repr names parents by short SHA rather than recursing into them
+    commit = commit_history[0]
+    assert repr(commit) == f"{commit} < {commit._parents[0]} {commit._author[0]}"
+    # Linking again rebuilds the children lists instead of duplicating them
+    children = {c: list(c._children) for c in commit_history}
+    git_obj.link_children()
+    assert {c: c._children for c in commit_history} == children
+
+def test_cached_git_log(temp_directory):
+    """
+    Test that cached_git_log() matches git_log() and is invalidated when refs move.
+    """
+    trc = ToyRepoCreator(temp_directory)
+    even_intervals = [7 * i for i in range(12)]  # Weekly intervals
+    trc.create_custom_commits(even_intervals)
+    cache_dir = os.path.join(temp_directory, 'cache')
+
+    commit_history = git_log(cwd=temp_directory)
+    assert cached_git_log(cache_dir, cwd=temp_directory) == commit_history  # Cold, fills the cache
+    assert cached_git_log(cache_dir, cwd=temp_directory) == commit_history  # Warm, read from the cache
+    cached = [f for _, _, files in os.walk(cache_dir) for f in files]
+    assert len(cached) == 1
+
+    trc.create_commit(13, 'Author 1', 'author1@example.com', trc.start_date)
+    assert len(cached_git_log(cache_dir, cwd=temp_directory)) == len(commit_history) + 1
+
+    # Rewinding the branch leaves the refs where they were before, but the reflog still holds the
+    # dropped commit, so the cached log must not be reused
+    git_run('reset', '--hard', 'HEAD~', cwd=temp_directory)
+    assert len(cached_git_log(cache_dir, cwd=temp_directory)) == len(git_log(cwd=temp_directory)) == len(commit_history) + 1
+
+def test_cached_git_log_empty_repo(temp_directory):
+    """
+    Test that cached_git_log() returns no commits for a repository without any, like git_log().
+    """
+    git_run('init', cwd=temp_directory)
+    cache_dir = os.path.join(temp_directory, 'cache')
+
+    assert git_log(cwd=temp_directory) == []
+    assert cached_git_log(cache_dir, cwd=temp_directory) == []
+    assert not os.path.exists(cache_dir)
+
+def test_git_log_with_cwd(temp_directory, monkeypatch):
+    """
+    Test that git_log(cwd=...) reads the given repository without changing directory.
+    """
+    trc = ToyRepoCreator(temp_directory)
+    even_intervals = [7 * i for i in range(12)]  # Weekly intervals
+    trc.create_custom_commits(even_intervals)
+    monkeypatch.chdir(tempfile.gettempdir())
+
+    commit_history = git_log(cwd=temp_directory)
+    assert len(commit_history) == len(even_intervals)
+    assert os.getcwd() == tempfile.gettempdir()
+
+def test_obj_many_with_cwd(temp_directory, monkeypatch):
+    """
+    Test that obj_many(cwd=...) reads unknown commits from the given repository, not the current one.
+    """
+    repo = os.path.join(temp_directory, 'repo')
+    other = os.path.join(temp_directory, 'other')
+    os.mkdir(repo)
+    os.mkdir(other)
+    ToyRepoCreator(repo).create_custom_commits([7 * i for i in range(12)])
+    commit_history = git_log(cwd=repo)
+    git_run('init', cwd=other)
+    monkeypatch.chdir(other)
+    for c in commit_history[:3]:
+        del git_obj.__all_obj__[c]
+
+    res = git_obj.obj_many(commit_history[:3], cwd=repo)
+    assert list(res) == commit_history[:3]
+    assert git_obj.obj(commit_history[0][:12], cwd=repo) is res[commit_history[0]]
+
+def test_from_show_matches_git_log(temp_directory):
+    """
+    Test that commits read through 'git cat-file --batch' carry the same fields as git_log().
+    """
+    trc = ToyRepoCreator(temp_directory)
+    even_intervals = [7 * i for i in range(12)]  # Weekly intervals
+    trc.create_custom_commits(even_intervals)
+    commit_history = git_log(cwd=temp_directory)
+
+    for expected in commit_history[:3]:
+        res = git_obj._from_show(expected[:10], cwd=temp_directory)  # Abbreviated SHAs resolve too
+        assert res == expected
+        assert res._when == expected._when
+        assert res._author == expected._author
+        assert res._tree == expected._tree
+        assert res._parents == expected._parents
+
+    with pytest.raises(KeyError):
+        git_obj._from_show('0' * 40, cwd=temp_directory)
+
+def test_obj_many(temp_directory):
+    """
+    Test that obj_many() resolves unknown commits in one batch and leaves out unknown SHAs.
+    """
+    trc = ToyRepoCreator(temp_directory)
+    even_intervals = [7 * i for i in range(12)]  # Weekly intervals
+    trc.create_custom_commits(even_intervals)
+    commit_history = git_log(cwd=temp_directory)
+    for c in commit_history[:3]:
+        del git_obj.__all_obj__[c]
+
+    wanted = [c[:12] for c in commit_history[:5]] + ['0' * 40]
+    res = git_obj.obj_many(wanted, cwd=temp_directory)
+    assert sorted(res) == sorted(wanted[:5])
+    for sha, expected in zip(wanted[:5], commit_history):
+        assert res[sha] == expected
+        assert res[sha]._when == expected._when
+        assert git_obj.obj(sha, cwd=temp_directory) is res[sha]  # Remembered abbreviation
+
+    with pytest.raises(KeyError):
+        git_obj.obj('0' * 40, cwd=temp_directory)
+
+def test_parse_headers_stops_at_message():
+    """
+    Test that header-like lines in the commit message are not taken for headers.
+    """
+    body = (b'tree ' + b'b' * 40 + b'\n'
+            b'author A U Thor <a@example.com> 1 +0000\n'
+            b'committer C O Mitter <c@example.com> 2 +0100\n'
+            b'\n'
+            b'parent ' + b'c' * 40 + b'\n'
+            b'tree ' + b'd' * 40 + b'\n')
+    sha, tree, parents, author, committer = git_obj._parse_headers('a', ('a' * 40, 'commit', body))
+    assert sha == 'a' * 40
+    assert tree == 'b' * 40
+    assert parents == []
+    assert author == ('A U Thor', 'a@example.com', 1)
+    assert committer == ('C O Mitter', 'c@example.com', 2)
+
+def test_known_prefixes():
+    """
+    Test that loaded commits resolve by unique abbreviation and ambiguous ones are left to git.
+    """
+    one = git_obj.commit(1, 'feedbeef1' + '0' * 31, '1' * 40, [], 'a@example.com', 'A')
+    two = git_obj.commit(2, 'feedbeef2' + '0' * 31, '1' * 40, [], 'a@example.com', 'A')
+    try:
+        assert git_obj._known(one) is one
+        assert git_obj._known('feedbeef1') is one
+        assert git_obj._known('feedbeef2') is two
+        assert git_obj._known('feedbeef') is None  # Ambiguous
+        assert git_obj._known('feedbeef3') is None
+    finally:
+        del git_obj.__all_obj__[one], git_obj.__all_obj__[two]
@@ -36,3 +36,23 @@ def test_gitsha_calibrate_min():
     assert sha1_updated._show_ == 7
     assert sha2_updated._show_ == 7
 
+
+def test_gitsha_get_instance():
+    # Creating a gitsha for a known SHA returns the existing instance
+    sha = git_sha("0123456789abcdef")
+
+    assert git_sha("0123456789abcdef") is sha
+    assert git_sha.get_instance("0123456789abcdef") is sha
+    assert git_sha.get_instance("fedcba9876543210") is None
+
+def test_gitsha_calibrate_min_neighbours():
+    # Each SHA only needs to be unique against its closest neighbours
+    near = git_sha("5555aaaa1111")
+    nearer = git_sha("5555aaab2222")
+    far = git_sha("5556ffff3333")
+
+    git_sha.calibrate_min()
+
+    assert str(near) == "5555aaaa"
+    assert str(nearer) == "5555aaab"
+    assert str(far) == "5556"
@@ -0,0 +1,49 @@
+import pytest
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from src.util.toy_repo import ToyRepoCreator
+from src.util.git_util import git_run, git_run_stream, git_cat_file
+
+@pytest.fixture(scope="function")
+def temp_directory():
+    # Create a temporary directory for each test function
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir  # Provide the temporary directory as a fixture
+    # Clean up: remove the temporary directory and its contents
+    subprocess.run(['rm', '-rf', temp_dir])
+
+def test_cat_file_shared_between_threads(temp_directory):
+    """
+    Test that concurrent lookups through one git_cat_file each get their own response.
+    """
+    trc = ToyRepoCreator(temp_directory)
+    even_intervals = [7 * i for i in range(12)]  # Weekly intervals
+    trc.create_custom_commits(even_intervals)
+    shas = git_run('rev-list', '--all', cwd=temp_directory).stdout.split()
+
+    cat_file = git_cat_file.for_repo(temp_directory)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        singles = list(pool.map(cat_file.get, shas * 4))
+        batches = list(pool.map(cat_file.get_many, [shas] * 4))
+
+    assert [res[0] for res in singles] == shas * 4
+    for batch in batches:
+        assert [res[0] for res in batch] == shas
+
+def test_stream_fails_partway_with_large_stderr(temp_directory):
+    """
+    Test that a command failing after some output raises once its lines are yielded,
+    even when its stderr is larger than the pipe buffer.
+    """
+    git_run('init', '-q', cwd=temp_directory)
+    fail = '!printf "a\\nb\\n"; head -c 200000 /dev/zero | tr "\\0" x >&2; exit 3'
+
+    lines = []
+    with pytest.raises(subprocess.CalledProcessError) as exc:
+        for line in git_run_stream('-c', f'alias.fail={fail}', 'fail', cwd=temp_directory):
+            lines.append(line)
+
+    assert lines == [b'a\n', b'b\n']
+    assert exc.value.returncode == 3
+    assert exc.value.stderr == b'x' * 200000
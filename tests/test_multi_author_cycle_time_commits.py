@@ -47,7 +47,7 @@ def test_cycle_time_between_commits_by_author_no_deviation(temp_directory):
     even_intervals = [7 * i for i in range(12)]  # Weekly intervals
     logging.debug('======= even_intervals =======: \n%s', even_intervals)
     trc.create_custom_commits(even_intervals)
-    logs = git_log()
+    logs = git_log(cwd=temp_directory)
     tds = calculate_time_deltas(logs)
     result = commit_statistics(tds, bucket_size=4)
 
@@ -88,7 +88,7 @@ def test_cycle_time_between_commits_by_author_no_deviation_clustered(temp_direct
     # [6, 7, 8, 6, 7, 8, 6, 7, 8, 6, 7, 8]
     logging.debug('======= varied_intervals =======: \n%s', varied_intervals)
     trc.create_custom_commits(varied_intervals)
-    logs = git_log()
+    logs = git_log(cwd=temp_directory)
     tds = calculate_time_deltas(logs)
     result = commit_statistics(tds, bucket_size=4)
 
@@ -129,7 +129,7 @@ def test_cycle_time_between_commits_by_author_small_deviation(temp_directory):
     small_deviation_intervals = [1, 10, 11, 15, 25, 26, 30, 40, 41, 45, 55, 56]
     logging.debug('======= even_intervals =======: \n%s', small_deviation_intervals)
     trc.create_custom_commits(small_deviation_intervals)
-    logs = git_log()
+    logs = git_log(cwd=temp_directory)
     tds = calculate_time_deltas(logs)
     result = commit_statistics(tds, bucket_size=4)
 
@@ -169,7 +169,7 @@ def test_cycle_time_between_commits_by_author_high_deviation(temp_directory):
     small_deviation_intervals = [1, 18, 40, 157, 255, 256, 257, 398, 431, 432, 433, 434]
     logging.debug('======= even_intervals =======: \n%s', small_deviation_intervals)
     trc.create_custom_commits(small_deviation_intervals)
-    logs = git_log()
+    logs = git_log(cwd=temp_directory)
     tds = calculate_time_deltas(logs)
     result = commit_statistics(tds, bucket_size=4)
 
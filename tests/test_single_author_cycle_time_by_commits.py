@@ -47,7 +47,7 @@ def test_cycle_time_between_commits_single_author_no_deviation(temp_directory):
     even_intervals = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12]
     logging.debug('======= even_intervals =======: \n%s', even_intervals)
     trc.create_custom_commits_single_author(even_intervals)
-    logs = git_log()
+    logs = git_log(cwd=temp_directory)
     tds = calculate_time_deltas(logs)
     result = commit_statistics(tds, bucket_size=4)
 
@@ -89,7 +89,7 @@ def test_cycle_time_between_commits_single_author_small_deviation(temp_directory
     even_intervals = [1, 2, 4, 7, 8, 10, 13, 14, 16, 19, 20, 22]
     logging.debug('======= even_intervals =======: \n%s', even_intervals)
     trc.create_custom_commits_single_author(even_intervals)
-    logs = git_log()
+    logs = git_log(cwd=temp_directory)
     tds = calculate_time_deltas(logs)
     result = commit_statistics(tds, bucket_size=4)
 
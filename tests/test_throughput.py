@@ -0,0 +1,92 @@
+import pytest
+import tempfile
+import logging
+import subprocess
+import os
+from src.util.toy_repo import ToyRepoCreator
+from src.calculators.throughput_calculator import (extract_commits_and_authors, calculate_throughput,
+                                                   throughput_stats_to_string, monthly_throughput_analysis)
+from src.git_ir import git_log
+from src.util.git_util import git_run
+import src.git_ir
+
+@pytest.fixture(scope="function")
+def setup_logging():
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+@pytest.fixture(scope="function")
+def temp_directory():
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    subprocess.run(['rm', '-rf', temp_dir])
+
+def test_throughput_by_month(temp_directory, setup_logging):
+    """
+    Tests the commits per unique developer calculation in a toy repository.
+
+    Twelve weekly commits starting September 1, 2023 rotate through four authors,
+    giving 5 commits by 4 authors in September, 4 by 4 in October and 3 by 3 in November.
+    """
+    trc = ToyRepoCreator(temp_directory)
+    trc.create_custom_commits([7 * i for i in range(12)])  # Weekly intervals for 12 weeks
+
+    logs = git_log(cwd=temp_directory)
+    data_by_month = extract_commits_and_authors(logs)
+    throughput_stats = calculate_throughput(data_by_month)
+
+    assert {month: count for month, (_, count) in data_by_month.items()} == {
+        '2023-9': 5,
+        '2023-10': 4,
+        '2023-11': 3,
+    }
+    assert throughput_stats == {
+        '2023-9': 1.25,
+        '2023-10': 1.0,
+        '2023-11': 1.0,
+    }
+
+def test_monthly_throughput_analysis_empty_and_rewritten(temp_directory, monkeypatch):
+    """
+    Tests the monthly entry point, which reads the cached log, on an empty repository and after
+    a branch was rewound, where the cache must not hand back a stale log.
+    """
+    monkeypatch.setattr(src.git_ir, 'GIT_LOG_CACHE_DIR', tempfile.mkdtemp(dir=temp_directory))
+    repo = os.path.join(temp_directory, 'repo')
+    os.mkdir(repo)
+    monkeypatch.chdir(repo)
+
+    git_run('init')
+    monthly_throughput_analysis()
+    with open('throughput_by_month.csv') as fin:
+        assert fin.read() == "Month,Commits Per Unique Developer\n"
+
+    trc = ToyRepoCreator(repo)
+    trc.create_custom_commits([7 * i for i in range(12)])  # Weekly intervals for 12 weeks
+    monthly_throughput_analysis()  # Fills the cache
+    trc.create_commit(13, 'Author 1', 'author1@example.com', trc.start_date)
+    git_run('reset', '--hard', 'HEAD~')  # The refs are back where they were, the reflog is not
+    monthly_throughput_analysis()
+
+    expected = throughput_stats_to_string(calculate_throughput(extract_commits_and_authors(git_log())))
+    with open('throughput_by_month.csv') as fin:
+        assert fin.read() == expected
+    assert expected.splitlines()[1:] == ['2023-10,1.00', '2023-11,1.00', '2023-9,1.50']
+
+def test_monthly_throughput_analysis_with_cwd(temp_directory, monkeypatch):
+    """
+    Tests that the monthly entry point analyzes the repository given by cwd, not the current directory.
+    """
+    monkeypatch.setattr(src.git_ir, 'GIT_LOG_CACHE_DIR', tempfile.mkdtemp(dir=temp_directory))
+    repo = os.path.join(temp_directory, 'repo')
+    out = os.path.join(temp_directory, 'out')
+    os.mkdir(repo)
+    os.mkdir(out)
+    ToyRepoCreator(repo).create_custom_commits([7 * i for i in range(12)])  # Weekly intervals for 12 weeks
+    monkeypatch.chdir(out)
+
+    monthly_throughput_analysis(cwd=repo)
+    with open('throughput_by_month.csv') as fin:
+        assert fin.read().splitlines()[1:] == ['2023-10,1.00', '2023-11,1.00', '2023-9,1.25']
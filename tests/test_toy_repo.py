@@ -28,5 +28,5 @@ def test_create_git_repo(temp_directory):
     trc = ToyRepoCreator(temp_directory)
     even_intervals = [7 * i for i in range(12)]  # Weekly intervals
     trc.create_custom_commits(even_intervals)
-    res = git_util.git_run('log')
+    res = git_util.git_run('log', cwd=temp_directory)
     logging.debug('======= res.stdout =======: \n%s', res.stdout)
\ No newline at end of file